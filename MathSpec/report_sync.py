@@ -0,0 +1,236 @@
+"""Incremental regeneration of the Markdown/ and Scaffold/ report trees.
+
+Each spec component is a report unit whose pages are rendered on their own
+with the math_spec_mapping per-component writers, keyed as in
+component_hashes. A page depends on every unit whose page names appear in
+it, through links such as [[DUMMY Entity]] or names in a diagram. After a
+spec change only these units are rendered:
+- the changed units;
+- the units whose pages depended on a changed unit at the last sync;
+- the units that a changed unit's pages depend on, before or after the
+  change, so back-references such as "Updated By" follow the edit.
+
+The spec tree, the parameter table and the displays summarize the whole
+spec and are rendered whenever anything changed. Rendered pages are
+synced: only files whose bytes differ are written and unchanged files keep
+their mtimes. Pages of removed units are deleted from the Markdown tree,
+as clear_folders would have done, and kept in the Scaffold tree.
+"""
+import filecmp
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from math_spec_mapping import (
+    write_boundary_action_markdown_report,
+    write_control_action_markdown_report,
+    write_entity_markdown_report,
+    write_mechanism_markdown_report,
+    write_parameter_markdown_report,
+    write_parameter_table,
+    write_policy_markdown_report,
+    write_space_markdown_report,
+    write_spec_tree,
+    write_state_markdown_report,
+    write_stateful_metrics_markdown_report,
+    write_types_markdown_report,
+    write_wiring_markdown_report,
+)
+from math_spec_mapping.Reports.markdown import (
+    write_displays_markdown_reports,
+    write_metrics_markdown_report,
+    write_state_variables_markdown_reports,
+)
+
+from spec_cache import CACHE_DIR, changed_components, component_hashes, spec_hash
+
+logger = logging.getLogger(__name__)
+
+def _files(root):
+    """Relative paths of the files under root, skipping hidden files and folders"""
+    paths = set()
+    for directory, folders, files in os.walk(root):
+        folders[:] = [folder for folder in folders if not folder.startswith(".")]
+        for name in files:
+            if not name.startswith("."):
+                paths.add(os.path.relpath(os.path.join(directory, name), root))
+    return paths
+
+
+def _prune(target, generated):
+    """Remove files under the top-level folders of generated that it does not list, as clear_folders would"""
+    folders = {path.split(os.sep)[0] for path in generated if os.sep in path}
+    removed = []
+    for path in sorted(_files(target) - set(generated)):
+        if path.split(os.sep)[0] in folders:
+            os.remove(os.path.join(target, path))
+            removed.append(path)
+    return removed
+
+
+def sync_tree(source, target, prune=False):
+    """Copy files from source that are missing or differ in target; returns (written, removed).
+
+    With prune, files under the top-level folders source produced that it
+    no longer produces are removed, as clear_folders would have done.
+    """
+    generated = _files(source)
+    written = []
+    for path in sorted(generated):
+        destination = os.path.join(target, path)
+        if os.path.exists(destination) and filecmp.cmp(os.path.join(source, path), destination, shallow=False):
+            continue
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(os.path.join(source, path), destination)
+        written.append(path)
+    removed = _prune(target, generated) if prune and os.path.isdir(target) else []
+    return written, removed
+
+
+def report_units(ms, math_spec_json):
+    """Map each report unit to a function rendering its pages into a folder.
+
+    Units are keyed "<section>/<component name>" as in component_hashes;
+    built-in components, such as the Empty Space, have no hash and are only
+    rendered by a full render.
+    """
+    units = {}
+
+    def add(section, names, writer):
+        for name in names:
+            units[f"{section}/{name}"] = lambda path, name=name: writer(ms, path, name)
+
+    add("Entities", ms.entities, write_entity_markdown_report)
+    for name in ms.state:
+        units[f"State/{name}"] = lambda path, name=name: (
+            write_state_markdown_report(ms, path, name), write_state_variables_markdown_reports(ms, path, name)
+        )
+    add("Types", ms.types, lambda spec, path, name: write_types_markdown_report(spec, path, spec.types[name]))
+    add("Boundary Actions", ms.boundary_actions, write_boundary_action_markdown_report)
+    add("Policies", ms.policies, write_policy_markdown_report)
+    add("Mechanisms", ms.mechanisms, write_mechanism_markdown_report)
+    add("Spaces", ms.spaces, write_space_markdown_report)
+    add("Control Actions", ms.control_actions, write_control_action_markdown_report)
+    add("Wiring", ms.wiring, write_wiring_markdown_report)
+    add("Metrics", ms.metrics, write_metrics_markdown_report)
+
+    # Parameters and stateful metrics are hashed by set but written one page each
+    def write_set(writer, names):
+        return lambda path: [writer(ms, path, name) for name in names]
+
+    for parameter_set in math_spec_json["Parameters"]:
+        names = [parameter["name"] for parameter in parameter_set["parameters"]]
+        units[f"Parameters/{parameter_set['name']}"] = write_set(write_parameter_markdown_report, names)
+    for metric_set in math_spec_json["Stateful Metrics"]:
+        names = [metric["name"] for metric in metric_set["metrics"]]
+        units[f"Stateful Metrics/{metric_set['name']}"] = write_set(write_stateful_metrics_markdown_report, names)
+    return units
+
+
+def _render_spec_pages(ms, path, markdown):
+    """The pages summarizing the whole spec; the tree and parameter table are Markdown only"""
+    if ms.displays:
+        write_displays_markdown_reports(ms, path, add_metadata=True)
+    if markdown:
+        write_spec_tree(ms, path=path, linking=True)
+        write_parameter_table(ms, path=path, linking=True)
+
+
+def _render(render, scratch):
+    """Run render into a fresh folder under scratch; returns (folder, relative page paths)"""
+    folder = tempfile.mkdtemp(dir=scratch)
+    render(folder)
+    return folder, sorted(_files(folder))
+
+
+def _dependencies(folder, pages, owners):
+    """Units whose page names appear in any of the pages"""
+    text = ""
+    for page in pages:
+        with open(os.path.join(folder, page)) as f:
+            text += f.read()
+    return sorted({unit for name, unit in owners.items() if name in text})
+
+
+def _remove(target, pages):
+    for page in pages:
+        path = os.path.join(target, page)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _page_name(page):
+    return os.path.splitext(os.path.basename(page))[0]
+
+
+def write_reports(ms, math_spec_json, markdown_dir="./Markdown", scaffold_dir="./Scaffold",
+                  state_path=os.path.join(CACHE_DIR, "reports.json"), force=False):
+    """Bring markdown_dir and scaffold_dir up to date with ms; returns the units rendered"""
+    hashes = component_hashes(math_spec_json)
+    key = spec_hash(hashes)
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    targets = {"markdown_dir": os.path.abspath(markdown_dir), "scaffold_dir": os.path.abspath(scaffold_dir)}
+    synced = not force and state.get("targets") == targets and all(os.path.isdir(path) for path in targets.values())
+    if synced and state.get("key") == key:
+        logger.info("Reports are up to date")
+        return []
+
+    units = report_units(ms, math_spec_json)
+    old_units = state.get("units", {}) if synced else {}
+    changed = set(changed_components(state.get("components", {}), hashes))
+    # First sync, new targets, forced, or only the library version changed
+    full = not old_units or not changed
+    if full:
+        selected = set(units)
+    else:
+        selected = changed & units.keys()
+        for unit, entry in old_units.items():
+            if unit in changed:
+                selected.update(entry["links"])
+            elif changed & set(entry["links"]):
+                selected.add(unit)
+        selected &= units.keys()
+
+    new_units = {unit: entry for unit, entry in old_units.items() if unit in units}
+    with tempfile.TemporaryDirectory() as scratch:
+        rendered = {unit: _render(units[unit], scratch) for unit in sorted(selected)}
+        owners = {_page_name(page): unit for unit, entry in new_units.items() for page in entry["pages"]}
+        owners.update({_page_name(page): unit for unit, (_, pages) in rendered.items() for page in pages})
+        # Units the changed units' pages now refer to, e.g. a state a mechanism started updating
+        for unit in changed & rendered.keys():
+            for dependency in _dependencies(*rendered[unit], owners):
+                if dependency not in rendered:
+                    rendered[dependency] = _render(units[dependency], scratch)
+
+        written = []
+        for unit, (folder, pages) in sorted(rendered.items()):
+            new_units[unit] = {"pages": pages, "links": _dependencies(folder, pages, owners)}
+            written += sync_tree(folder, markdown_dir)[0]
+            sync_tree(folder, scaffold_dir)
+            _remove(markdown_dir, set(old_units.get(unit, {}).get("pages", ())) - set(pages))
+        for unit in old_units.keys() - units.keys():
+            _remove(markdown_dir, old_units[unit]["pages"])
+
+        folder, spec_pages = _render(lambda path: _render_spec_pages(ms, path, markdown=True), scratch)
+        written += sync_tree(folder, markdown_dir)[0]
+        sync_tree(_render(lambda path: _render_spec_pages(ms, path, markdown=False), scratch)[0], scaffold_dir)
+        _remove(markdown_dir, set(state.get("spec_pages", ())) - set(spec_pages))
+
+    if full:
+        generated = spec_pages + [page for entry in new_units.values() for page in entry["pages"]]
+        _prune(markdown_dir, generated)
+    logger.info(f"Rendered {len(rendered)} of {len(units)} report units for {len(changed)} changed components; "
+                f"{len(written)} Markdown files written")
+
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    with open(state_path, "w") as f:
+        json.dump({"key": key, "targets": targets, "components": hashes, "units": new_units,
+                   "spec_pages": spec_pages}, f, indent=2, sort_keys=True)
+    return sorted(rendered)
@@ -1,14 +1,13 @@
-from math_spec_mapping import (load_from_json, write_spec_tree, write_parameter_table, write_all_markdown_reports, remove_dummy_repo_components)
+from math_spec_mapping import remove_dummy_repo_components
 
-from copy import deepcopy
+from spec_cache import load_spec
+from report_sync import write_reports
 from src import math_spec_json
 
-ms = load_from_json(deepcopy(math_spec_json))
+ms = load_spec(math_spec_json)
 
 
 markdown_dir = "./Markdown"
 scaffold_dir = "./Scaffold"
-write_all_markdown_reports(ms, markdown_dir, clear_folders=True)
-write_spec_tree(ms, path=markdown_dir, linking=True)
-write_parameter_table(ms, path=markdown_dir, linking=True)
-write_all_markdown_reports(ms, scaffold_dir, clear_folders=False)
\ No newline at end of file
+# Only pages whose content changed are rewritten
+write_reports(ms, math_spec_json, markdown_dir, scaffold_dir)
@@ -0,0 +1,112 @@
+"""Content-hashed cache of the spec built by math_spec_mapping.load_from_json.
+
+The key is a hash over every component dict under src plus the installed
+math_spec_mapping version, so an unchanged spec is unpickled instead of
+rebuilt. Per-component hashes are stored next to the pickle; on a miss the
+components whose definitions changed are logged before the rebuild.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from copy import deepcopy
+from importlib.metadata import PackageNotFoundError, version
+
+from math_spec_mapping import load_from_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "./.spec_cache"
+
+
+def _digest(value):
+    # Component dicts are plain data; repr covers the odd tuple or None
+    encoded = json.dumps(value, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def component_hashes(math_spec_json):
+    """Map "<section>/<component name>" to the hash of its definition"""
+    hashes = {}
+    for section, components in math_spec_json.items():
+        if isinstance(components, dict):
+            items = components.items()
+        else:
+            items = ((component.get("name", i), component) for i, component in enumerate(components))
+        for name, component in items:
+            hashes[f"{section}/{name}"] = _digest(component)
+    return hashes
+
+
+def spec_hash(hashes):
+    """Hash of the whole spec from its component hashes and the library version"""
+    try:
+        library = version("math-spec-mapping")
+    except PackageNotFoundError:
+        library = None
+    return _digest({"math_spec_mapping": library, "components": hashes})
+
+
+def changed_components(old, new):
+    """Components added, removed or edited between two component_hashes results"""
+    return sorted(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, data, mode="wb"):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_spec(math_spec_json, cache_dir=CACHE_DIR):
+    """load_from_json(deepcopy(math_spec_json)), served from cache_dir when unchanged.
+
+    load_from_json validates and links the whole spec in one pass, so any
+    change rebuilds everything; the changed components are only reported.
+    """
+    hashes = component_hashes(math_spec_json)
+    key = spec_hash(hashes)
+    pickle_path = os.path.join(cache_dir, f"{key}.pkl")
+
+    if os.path.exists(pickle_path):
+        try:
+            with open(pickle_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.warning(f"Ignoring unreadable spec cache {pickle_path}: {e}")
+
+    manifest = _read_manifest(cache_dir)
+    if manifest:
+        changed = changed_components(manifest.get("components", {}), hashes)
+        logger.info(f"Spec changed in {len(changed)} components: {', '.join(changed) or 'library version'}")
+
+    ms = load_from_json(deepcopy(math_spec_json))
+
+    try:
+        data = pickle.dumps(ms, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning(f"Spec could not be cached: {e}")
+        return ms
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Only the latest spec is kept
+    stale = manifest.get("key")
+    if stale and stale != key:
+        try:
+            os.remove(os.path.join(cache_dir, f"{stale}.pkl"))
+        except OSError:
+            pass
+    _write_atomic(pickle_path, data)
+    _write_atomic(os.path.join(cache_dir, "manifest.json"),
+                  json.dumps({"key": key, "components": hashes}, indent=2, sort_keys=True), mode="w")
+    return ms
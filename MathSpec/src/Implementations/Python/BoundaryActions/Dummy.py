@@ -1,5 +1,9 @@
 from random import choice
 
+import numpy as np
+
+ABC = np.array(["A", "B", "C"], dtype=object)
+
 
 def v1_dummy_boundary(state, params, spaces):
     return [{"string": choice(["A", "B", "C"])}]
@@ -15,3 +19,22 @@ def v2_dummy_boundary2(state, params, spaces):
     first = choice(["A", "B", "C"])
     second = choice([x for x in ["A", "B", "C"] if x != first])
     return [{"string": first + second}]
+
+
+# Vectorized variants over a batch of runs (see ..batch)
+
+
+def v1_dummy_boundary_vectorized(state, params, spaces):
+    return [{"string": state["RNG"].choice(ABC, state["Batch Size"])}]
+
+
+def v1_dummy_boundary2_vectorized(state, params, spaces):
+    n = state["Batch Size"]
+    return [{"string": state["RNG"].choice(ABC, n) + state["RNG"].choice(ABC, n)}]
+
+
+def v2_dummy_boundary2_vectorized(state, params, spaces):
+    n = state["Batch Size"]
+    first = state["RNG"].integers(0, 3, n)
+    second = (first + state["RNG"].integers(1, 3, n)) % 3
+    return [{"string": ABC[first] + ABC[second]}]
@@ -1,7 +1,20 @@
-from .Dummy import v1_dummy_boundary, v1_dummy_boundary2, v2_dummy_boundary2
+from .Dummy import (
+    v1_dummy_boundary,
+    v1_dummy_boundary2,
+    v2_dummy_boundary2,
+    v1_dummy_boundary_vectorized,
+    v1_dummy_boundary2_vectorized,
+    v2_dummy_boundary2_vectorized,
+)
 
 boundary_action_options = {
     "Length-1 ABC Equal Weight Option": v1_dummy_boundary,
     "DUMMY Length-2 ABC Equal Weight Option": v1_dummy_boundary2,
     "DUMMY Length-2 ABC Equal Weight 2 Option": v2_dummy_boundary2,
 }
+
+vectorized_boundary_action_options = {
+    "Length-1 ABC Equal Weight Option": v1_dummy_boundary_vectorized,
+    "DUMMY Length-2 ABC Equal Weight Option": v1_dummy_boundary2_vectorized,
+    "DUMMY Length-2 ABC Equal Weight 2 Option": v2_dummy_boundary2_vectorized,
+}
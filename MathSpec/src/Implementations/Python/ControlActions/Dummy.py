@@ -1,5 +1,9 @@
 from random import choice, choices
 
+import numpy as np
+
+DEF = np.array(["D", "E", "F"], dtype=object)
+
 
 def v1_dummy_control(state, params, spaces):
     return [{"string": choice(["D", "E", "F"])}]
@@ -9,3 +13,17 @@ def v2_dummy_control(state, params, spaces):
     p1 = params["DUMMY D Probability"]
     p2 = (1 - p1) / 2
     return [{"string": choices(["D", "E", "F"], weights=[p1, p2, p2])[0]}]
+
+
+# Vectorized variants over a batch of runs (see ..batch)
+
+
+def v1_dummy_control_vectorized(state, params, spaces):
+    return [{"string": state["RNG"].choice(DEF, state["Batch Size"])}]
+
+
+def v2_dummy_control_vectorized(state, params, spaces):
+    p1 = params["DUMMY D Probability"]
+    p2 = (1 - p1) / 2
+    draws = state["RNG"].random(state["Batch Size"])
+    return [{"string": DEF[(draws >= p1).astype(int) + (draws >= p1 + p2)]}]
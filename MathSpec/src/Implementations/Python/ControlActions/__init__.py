@@ -1,6 +1,16 @@
-from .Dummy import v1_dummy_control, v2_dummy_control
+from .Dummy import (
+    v1_dummy_control,
+    v2_dummy_control,
+    v1_dummy_control_vectorized,
+    v2_dummy_control_vectorized,
+)
 
 control_action_options = {
     "DUMMY Length-1 DEF Equal Weight Option": v1_dummy_control,
     "DUMMY Length-1 DEF D Probability Option": v2_dummy_control,
 }
+
+vectorized_control_action_options = {
+    "DUMMY Length-1 DEF Equal Weight Option": v1_dummy_control_vectorized,
+    "DUMMY Length-1 DEF D Probability Option": v2_dummy_control_vectorized,
+}
@@ -9,11 +9,27 @@ def dummy_increment_time_mechanism(state, params, spaces):
     state["Time"] += 1
 
 
+# Rows follow the "columns" metadata of the Simulation Log variable in State/Global.py
 def dummy_log_simulation_data_mechanism(state, params, spaces):
-    state["Simulation Log"].append(
-        {
-            "Time": state["Time"],
-            "Word": state["Dummy"]["Words"],
-            "Length (Multiplied)": state["Dummy"]["Total Length"],
-        }
+    state["Simulation Log"].append_row(
+        state["Time"], state["Dummy"]["Words"], state["Dummy"]["Total Length"]
+    )
+
+
+# Vectorized variants over a batch of runs (see ..batch)
+
+
+def dummy_update_dummy_entity_mechanism_vectorized(state, params, spaces):
+    state["Dummy"]["Words"] = state["Dummy"]["Words"] + spaces[0]["string"]
+    state["Dummy"]["Total Length"] = state["Dummy"]["Total Length"] + spaces[0]["length"]
+
+
+def dummy_increment_time_mechanism_vectorized(state, params, spaces):
+    state["Time"] = state["Time"] + 1
+
+
+def dummy_log_simulation_data_mechanism_vectorized(state, params, spaces):
+    # Each column gets one row of run values per step
+    state["Simulation Log"].append_row(
+        state["Time"], state["Dummy"]["Words"], state["Dummy"]["Total Length"]
     )
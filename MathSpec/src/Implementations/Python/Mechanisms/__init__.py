@@ -2,6 +2,9 @@ from .Dummy import (
     dummy_update_dummy_entity_mechanism,
     dummy_increment_time_mechanism,
     dummy_log_simulation_data_mechanism,
+    dummy_update_dummy_entity_mechanism_vectorized,
+    dummy_increment_time_mechanism_vectorized,
+    dummy_log_simulation_data_mechanism_vectorized,
 )
 
 mechanisms = {
@@ -9,3 +12,9 @@ mechanisms = {
     "DUMMY Increment Time Mechanism": dummy_increment_time_mechanism,
     "DUMMY Log Simulation Data Mechanism": dummy_log_simulation_data_mechanism,
 }
+
+vectorized_mechanisms = {
+    "DUMMY Update Dummy Entity Mechanism": dummy_update_dummy_entity_mechanism_vectorized,
+    "DUMMY Increment Time Mechanism": dummy_increment_time_mechanism_vectorized,
+    "DUMMY Log Simulation Data Mechanism": dummy_log_simulation_data_mechanism_vectorized,
+}
@@ -1,2 +1,10 @@
+import numpy as np
+
+
 def dummy_multiplied_length_metric(state, params, spaces):
     return len(spaces[0]["string"]) * params["DUMMY Length Multiplier"]
+
+
+def dummy_multiplied_length_metric_vectorized(state, params, spaces):
+    lengths = np.char.str_len(spaces[0]["string"].astype(str))
+    return lengths * params["DUMMY Length Multiplier"]
@@ -1,4 +1,10 @@
-from .Dummy import dummy_multiplied_length_metric
+from .Dummy import (
+    dummy_multiplied_length_metric,
+    dummy_multiplied_length_metric_vectorized,
+)
 
 
 metrics = {"DUMMY Multiplied Length Metric": dummy_multiplied_length_metric}
+vectorized_metrics = {
+    "DUMMY Multiplied Length Metric": dummy_multiplied_length_metric_vectorized
+}
@@ -1,5 +1,21 @@
+import numpy as np
+
+
 def dummy_letter_count_policy(state, params, spaces):
     starting_string = spaces[0]["string"]
     unique = len(set(list(starting_string)))
     length = state["Metrics"]["DUMMY Multiplied Length Metric"](state, params, spaces)
     return [{"string": starting_string, "unique_length": unique, "length": length}]
+
+
+def dummy_letter_count_policy_vectorized(state, params, spaces):
+    starting_string = spaces[0]["string"]
+    # One row of character codes per run, zero-padded to the longest string
+    codes = np.asarray(starting_string, dtype=str)
+    characters = codes.view(np.uint32).reshape(len(codes), -1)
+    characters = np.sort(characters, axis=1)
+    # Distinct letters are the non-zero steps in each sorted row, plus a
+    # non-zero first code when the row has no padding
+    unique = np.count_nonzero(np.diff(characters, axis=1), axis=1) + (characters[:, 0] != 0)
+    length = state["Metrics"]["DUMMY Multiplied Length Metric"](state, params, spaces)
+    return [{"string": starting_string, "unique_length": unique, "length": length}]
@@ -1,4 +1,7 @@
-from .Dummy import dummy_letter_count_policy
+from .Dummy import dummy_letter_count_policy, dummy_letter_count_policy_vectorized
 
 
 policies = {"DUMMY Letter Count Policy V1": dummy_letter_count_policy}
+vectorized_policies = {
+    "DUMMY Letter Count Policy V1": dummy_letter_count_policy_vectorized
+}
@@ -1,3 +1,6 @@
 from .Dummy import dummy_metric
 
 stateful_metrics = {"DUMMY Nominal Length Stateful Metric": dummy_metric}
+
+# The scalar implementation already works on batched state
+vectorized_stateful_metrics = {"DUMMY Nominal Length Stateful Metric": dummy_metric}
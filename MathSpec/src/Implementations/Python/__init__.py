@@ -1,9 +1,9 @@
-from .BoundaryActions import boundary_action_options
-from .ControlActions import control_action_options
-from .Mechanisms import mechanisms
-from .Policies import policies
-from .StatefulMetrics import stateful_metrics
-from .Metrics import metrics
+from .BoundaryActions import boundary_action_options, vectorized_boundary_action_options
+from .ControlActions import control_action_options, vectorized_control_action_options
+from .Mechanisms import mechanisms, vectorized_mechanisms
+from .Policies import policies, vectorized_policies
+from .StatefulMetrics import stateful_metrics, vectorized_stateful_metrics
+from .Metrics import metrics, vectorized_metrics
 
 
 implementation = {
@@ -14,3 +14,16 @@ implementation = {
     "stateful_metrics": stateful_metrics,
     "metrics": metrics,
 }
+
+# Variants over a batch of independent runs held in arrays (see .batch); blocks
+# without one fall back to their scalar implementation per run. Kept apart from
+# implementation, which math_spec_mapping loads and expects to map each block
+# to a single function
+vectorized_implementation = {
+    "control_action_options": vectorized_control_action_options,
+    "mechanisms": vectorized_mechanisms,
+    "policies": vectorized_policies,
+    "boundary_action_options": vectorized_boundary_action_options,
+    "stateful_metrics": vectorized_stateful_metrics,
+    "metrics": vectorized_metrics,
+}
@@ -0,0 +1,167 @@
+"""Run the same wiring over a batch of independent runs held in arrays.
+
+A batched state mirrors the scalar state with every scalar replaced by an
+array over the runs, e.g. state["Dummy"]["Total Length"] of shape (n,),
+plus "Batch Size" and a NumPy "RNG". Parameters may be scalars shared by
+all runs or arrays with one value per run, as built by batch_params or by
+parameter_grid for a grid study. Every value in a batched space holds one
+value per run, unless it is a scalar shared by all of them.
+
+Which state and parameter entries hold one value per run is recorded
+explicitly, under state["Per Run"] and params["Per Run"] as paths of keys,
+by batch_state and batch_params. Any other entry, even an array that
+happens to have one item per run, is shared by the whole batch.
+
+Blocks run their variant from the vectorized implementation when they
+declare one; any other block falls back to its scalar function, called
+once per run on that run's slice of the batch.
+"""
+from itertools import product
+
+import numpy as np
+
+from . import vectorized_implementation as default_vectorized
+from .executor import WiringCompiler
+
+# Key listing the per-run entries of a batched state or parameter dict
+PER_RUN = "Per Run"
+
+
+def _column(values):
+    """Stack per-run values, keeping strings as objects so they can be appended to"""
+    column = np.array(values)
+    return column.astype(object) if column.dtype.kind == "U" else column
+
+
+def batch_state(state, n, seed=None):
+    """Batched state of n runs that all start from the scalar state"""
+    per_run = set()
+
+    def replicate(value, path):
+        if isinstance(value, dict):
+            return {key: replicate(item, path + (key,)) for key, item in value.items()}
+        if isinstance(value, (bool, int, float, str)):
+            per_run.add(path)
+            return _column([value] * n)
+        # Logs and other containers are shared by the batch
+        return value
+
+    batched = replicate(state, ())
+    batched["Batch Size"] = n
+    batched["RNG"] = np.random.default_rng(seed)
+    batched[PER_RUN] = frozenset(per_run)
+    return batched
+
+
+def batch_params(params, per_run):
+    """Params with the per_run arrays, one value per run each, marked as per run"""
+    batched = dict(params)
+    batched.update(per_run)
+    batched[PER_RUN] = frozenset(params.get(PER_RUN, ())) | {(name,) for name in per_run}
+    return batched
+
+
+def parameter_grid(params, grid):
+    """Params with one run per combination of the grid values; returns (params, n)"""
+    combinations = list(product(*grid.values()))
+    per_run = {name: np.array([combination[i] for combination in combinations]) for i, name in enumerate(grid)}
+    return batch_params(params, per_run), len(combinations)
+
+
+def _item(value, i):
+    item = value[i]
+    return item.item() if isinstance(item, np.generic) else item
+
+
+def _run_slice(value, i, per_run, path=()):
+    if isinstance(value, dict):
+        return {key: _run_slice(item, i, per_run, path + (key,)) for key, item in value.items() if key != PER_RUN}
+    return _item(value, i) if path in per_run else value
+
+
+def _space_slice(space, i):
+    if not isinstance(space, dict):
+        return space
+    return {key: _item(value, i) if np.ndim(value) else value for key, value in space.items()}
+
+
+def _write_back(batched, run, i, per_run, path=()):
+    for key, value in batched.items():
+        if isinstance(value, dict):
+            _write_back(value, run[key], i, per_run, path + (key,))
+        elif path + (key,) in per_run:
+            value[i] = run[key]
+
+
+def _stack_outputs(outputs):
+    """Per-run results of a block as one batched result"""
+    if all(output is None for output in outputs):
+        return None
+    if isinstance(outputs[0], list):
+        return [
+            {key: _column([output[j][key] for output in outputs]) for key in outputs[0][j]}
+            for j in range(len(outputs[0]))
+        ]
+    return _column(outputs)
+
+
+def scalar_fallback(function, n, bindings=None):
+    """Run a scalar block on each of the n runs of a batch in turn.
+
+    bindings replace state entries, such as "Metrics", whose batched values
+    cannot be used by a scalar function.
+    """
+
+    def run(state, params, *spaces):
+        # Stateful metrics take no spaces argument
+        state_per_run = state.get(PER_RUN, frozenset())
+        params_per_run = params.get(PER_RUN, frozenset())
+        outputs = []
+        for i in range(n):
+            run_state = _run_slice(state, i, state_per_run)
+            run_state.update(bindings or {})
+            run_spaces = [[_space_slice(space, i) for space in argument] for argument in spaces]
+            outputs.append(function(run_state, _run_slice(params, i, params_per_run), *run_spaces))
+            _write_back(state, run_state, i, state_per_run)
+        return _stack_outputs(outputs)
+
+    run.__name__ = f"{function.__name__}_fallback"
+    return run
+
+
+class BatchWiringCompiler(WiringCompiler):
+    def __init__(self, math_spec_json, n, implementation=None, options=None, vectorized=None):
+        """vectorized holds the batched variants to run; by default those of this
+        package when implementation is the default too, else none"""
+        super().__init__(math_spec_json, implementation, options)
+        self.n = n
+        if vectorized is None:
+            vectorized = default_vectorized if implementation is None else {}
+        self.vectorized = vectorized
+
+    def function(self, name):
+        implementation_key, key = self.resolve(name)
+        return self._batched(implementation_key, key)
+
+    def _batched(self, implementation_key, key):
+        vectorized = self.vectorized.get(implementation_key, {})
+        if key in vectorized:
+            return vectorized[key]
+        bindings = {
+            "Metrics": self.implementation["metrics"],
+            "Stateful Metrics": self.implementation["stateful_metrics"],
+        }
+        return scalar_fallback(self.implementation[implementation_key][key], self.n, bindings)
+
+    def bind_metrics(self, state):
+        """Attach the batched metric functions to a batched state"""
+        state["Metrics"] = {key: self._batched("metrics", key) for key in self.implementation["metrics"]}
+        state["Stateful Metrics"] = {
+            key: self._batched("stateful_metrics", key) for key in self.implementation["stateful_metrics"]
+        }
+        return state
+
+
+def compile_batched_wirings(math_spec_json, n, implementation=None, options=None, vectorized=None):
+    """Batched plans over n runs for every wiring in the spec, keyed by wiring name"""
+    return BatchWiringCompiler(math_spec_json, n, implementation, options, vectorized).compile_all()
@@ -0,0 +1,166 @@
+"""Compile the Stack and Parallel wirings of a spec into flat callable plans.
+
+A compiled Plan is called like any block, plan(state, params, spaces), and
+returns the spaces its last component produced. Everything that can be
+resolved ahead of time is resolved once when compiling: component lookups,
+the chosen option of each action and policy, how a Parallel splits its
+input spaces, and the metric functions bound into state["Metrics"].
+
+A Stack feeds each component the spaces returned by the one before it; a
+Parallel hands each component its own slice of the input, sized by the
+component's domain, and concatenates what they return. Nested Stacks are
+inlined into their parent Stack and nested Parallels into their parent
+Parallel, so a step is either a single call or one Parallel group. A
+component at one of a Stack's optional_indices is skipped, passing its
+input through unchanged, when it receives fewer spaces than its domain
+declares or any of them is None.
+"""
+from ...TypeMappings.state_layout import materialize_state
+from ...TypeMappings.types import mapping as default_mapping
+from . import implementation as default_implementation
+
+# Spec section, options key in the spec and implementation dict of each block kind
+BLOCK_KINDS = [
+    ("Boundary Actions", "boundary_action_options", "boundary_action_options"),
+    ("Control Actions", "control_action_options", "control_action_options"),
+    ("Policies", "policy_options", "policies"),
+    ("Mechanisms", None, "mechanisms"),
+]
+
+
+class Plan:
+    __slots__ = ("name", "steps", "domain_size")
+
+    def __init__(self, name, steps, domain_size):
+        self.name = name
+        # (function, routes, optional, domain size); routes is None for a single
+        # call, else the (function, input slice) pairs of a Parallel group
+        self.steps = steps
+        self.domain_size = domain_size
+
+    def __call__(self, state, params, spaces=()):
+        for function, routes, optional, domain_size in self.steps:
+            if optional and (len(spaces) < domain_size or None in spaces[:domain_size]):
+                continue
+            if routes is None:
+                spaces = function(state, params, spaces) or []
+            else:
+                outputs = []
+                for component, inputs in routes:
+                    outputs.extend(component(state, params, spaces[inputs]) or ())
+                spaces = outputs
+        return spaces
+
+    def __repr__(self):
+        return f"Plan({self.name!r}, {len(self.steps)} steps)"
+
+
+class WiringCompiler:
+    def __init__(self, math_spec_json, implementation=None, options=None):
+        """options maps a block name to the name of the option to run; by default
+        the first option the spec lists is used"""
+        self.implementation = implementation if implementation is not None else default_implementation
+        self.options = options or {}
+        self.wirings = {wiring["name"]: wiring for wiring in math_spec_json["Wiring"]}
+        self.blocks = {}
+        for section, options_key, implementation_key in BLOCK_KINDS:
+            for block in math_spec_json.get(section, []):
+                self.blocks[block["name"]] = (block, options_key, implementation_key)
+        self._plans = {}
+
+    def resolve(self, name):
+        """(implementation dict key, function key) of the implementation that runs for block name"""
+        block, options_key, implementation_key = self.blocks[name]
+        if options_key is None:
+            key = name
+        else:
+            available = [option["name"] for option in block[options_key]]
+            key = self.options.get(name, available[0] if available else None)
+            if key not in available:
+                raise ValueError(f"{key!r} is not an option of {name!r}; expected one of {available}")
+        if key not in self.implementation[implementation_key]:
+            raise ValueError(f"No implementation for {key!r} ({name!r})")
+        for metric in block.get("metrics_used", []):
+            if metric not in self.implementation["metrics"]:
+                raise ValueError(f"{name!r} uses metric {metric!r} which has no implementation")
+        return implementation_key, key
+
+    def function(self, name):
+        """The implementation that runs for block name"""
+        implementation_key, key = self.resolve(name)
+        return self.implementation[implementation_key][key]
+
+    def domain_size(self, name):
+        if name in self.blocks:
+            return len(self.blocks[name][0].get("domain", []))
+        wiring = self.wirings[name]
+        if wiring["type"] == "Stack":
+            return self.domain_size(wiring["components"][0])
+        return sum(self.domain_size(component) for component in wiring["components"])
+
+    def compile(self, name):
+        """The Plan for wiring name, compiled once and reused"""
+        if name not in self._plans:
+            if name not in self.wirings:
+                raise ValueError(f"Unknown wiring {name!r}")
+            wiring = self.wirings[name]
+            if wiring["type"] == "Stack":
+                steps = self._stack_steps(wiring)
+            elif wiring["type"] == "Parallel":
+                steps = [(None, tuple(self._parallel_routes(wiring, 0)), False, self.domain_size(name))]
+            else:
+                raise ValueError(f"Unsupported wiring type {wiring['type']!r} in {name!r}")
+            self._plans[name] = Plan(name, steps, self.domain_size(name))
+        return self._plans[name]
+
+    def compile_all(self):
+        return {name: self.compile(name) for name in self.wirings}
+
+    def _callable(self, name):
+        return self.function(name) if name in self.blocks else self.compile(name)
+
+    def _stack_steps(self, wiring):
+        optional_indices = set(wiring.get("optional_indices", []))
+        steps = []
+        for i, component in enumerate(wiring["components"]):
+            optional = i in optional_indices
+            nested = self.wirings.get(component)
+            if nested is not None and nested["type"] == "Stack" and not optional:
+                steps.extend(self._stack_steps(nested))
+            elif nested is not None and nested["type"] == "Parallel":
+                steps.append((None, tuple(self._parallel_routes(nested, 0)), optional,
+                              self.domain_size(component)))
+            else:
+                steps.append((self._callable(component), None, optional, self.domain_size(component)))
+        return steps
+
+    def _parallel_routes(self, wiring, offset):
+        routes = []
+        for component in wiring["components"]:
+            size = self.domain_size(component)
+            nested = self.wirings.get(component)
+            if nested is not None and nested["type"] == "Parallel":
+                routes.extend(self._parallel_routes(nested, offset))
+            else:
+                routes.append((self._callable(component), slice(offset, offset + size)))
+            offset += size
+        return routes
+
+
+def compile_wirings(math_spec_json, implementation=None, options=None):
+    """Plans for every wiring in the spec, keyed by wiring name"""
+    return WiringCompiler(math_spec_json, implementation, options).compile_all()
+
+
+def bind_metrics(state, implementation=None):
+    """Attach the metric functions to state once, before the first step"""
+    implementation = implementation if implementation is not None else default_implementation
+    state["Metrics"] = dict(implementation["metrics"])
+    state["Stateful Metrics"] = dict(implementation["stateful_metrics"])
+    return state
+
+
+def initial_state(math_spec_json, mapping=None, implementation=None, counts=None):
+    """The top-level state wirings run on, materialized from the spec with its metrics bound"""
+    mapping = mapping if mapping is not None else default_mapping
+    return bind_metrics(materialize_state(math_spec_json, mapping, counts)["Global"], implementation)
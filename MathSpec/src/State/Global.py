@@ -8,6 +8,7 @@ global_state = {
             "description": "The dummy entity",
             "symbol": None,
             "domain": None,
+            "metadata": {"entity": "DUMMY Entity"},
         },
         {
             "type": "DUMMY Integer Type",
@@ -22,6 +23,7 @@ global_state = {
             "description": "The simulation log holding historical data",
             "symbol": None,
             "domain": None,
+            "metadata": {"columns": ["Time", "Word", "Length (Multiplied)"]},
         },
     ],
 }
@@ -0,0 +1,131 @@
+"""Columnar, bounded log for the "Simulation Log" state variable."""
+import os
+
+import numpy as np
+
+
+class SimulationLog:
+    """Log of one row per logged step, held in preallocated NumPy columns.
+
+    Rows are added with append_row(*values) in column order, so logging does
+    not build a dict per step; append(entry) accepts the old dict entries.
+    Column dtypes and per-row shapes are taken from the first row, so a
+    batched run can log one array of run values per column and step.
+
+    every keeps only every k-th step. window keeps only the last window rows
+    in a ring buffer. Otherwise the columns grow, or with spill_dir set are
+    written to disk in chunks of capacity rows whenever they fill up.
+    """
+
+    def __init__(self, columns, capacity=1024, every=1, window=None, spill_dir=None):
+        if window is not None and spill_dir is not None:
+            raise ValueError("A ring buffer log cannot spill to disk")
+        self.columns = list(columns)
+        self.every = every
+        self.window = window
+        self.spill_dir = spill_dir
+        self.capacity = window or capacity
+        self.steps = 0  # Steps offered, before decimation
+        self.total = 0  # Rows kept, including spilled and overwritten ones
+        self.size = 0  # Rows in the in-memory buffer
+        self.chunks = []
+        self._arrays = None
+
+    def _allocate(self, values):
+        self._arrays = []
+        for value in values:
+            sample = np.asarray(value)
+            dtype = object if sample.dtype.kind in "USO" else sample.dtype
+            self._arrays.append(np.empty((self.capacity,) + sample.shape, dtype=dtype))
+
+    def _grow(self):
+        self.capacity *= 2
+        for i, array in enumerate(self._arrays):
+            grown = np.empty((self.capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: self.size] = array[: self.size]
+            self._arrays[i] = grown
+
+    def _spill(self):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"log_{len(self.chunks):05d}.npz")
+        # Object columns hold strings; stored as fixed-width text they load without pickle
+        np.savez(path, *(array[: self.size].astype(str) if array.dtype == object else array[: self.size]
+                         for array in self._arrays))
+        self.chunks.append(path)
+        self.size = 0
+
+    def append_row(self, *values):
+        step = self.steps
+        self.steps += 1
+        if step % self.every:
+            return
+        if self._arrays is None:
+            self._allocate(values)
+        if self.window is not None:
+            row = self.total % self.window
+            self.size = min(self.size + 1, self.window)
+        else:
+            if self.size == self.capacity:
+                if self.spill_dir is not None:
+                    self._spill()
+                else:
+                    self._grow()
+            row = self.size
+            self.size += 1
+        for array, value in zip(self._arrays, values):
+            array[row] = value
+        self.total += 1
+
+    def append(self, entry):
+        self.append_row(*(entry[name] for name in self.columns))
+
+    def column(self, name):
+        """All kept rows of one column, oldest first.
+
+        A view of the buffer unless rows were spilled or the ring wrapped.
+        """
+        if self._arrays is None:
+            return np.empty(0)
+        i = self.columns.index(name)
+        array = self._arrays[i]
+        if self.window is not None and self.total > self.window:
+            start = self.total % self.window
+            return np.concatenate([array[start:], array[:start]])
+        if not self.chunks:
+            return array[: self.size]
+        spilled = []
+        for path in self.chunks:
+            with np.load(path) as chunk:
+                spilled.append(chunk[f"arr_{i}"].astype(array.dtype))
+        return np.concatenate(spilled + [array[: self.size]])
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def __len__(self):
+        return self.total if self.window is None else self.size
+
+    def __iter__(self):
+        columns = [self.column(name) for name in self.columns]
+        for values in zip(*columns):
+            yield dict(zip(self.columns, values))
+
+    def to_frame(self, run=None):
+        """The log as a pandas DataFrame, sharing memory with the buffer where possible.
+
+        Batched logs hold a row of run values per step; pick one with run.
+        """
+        import pandas as pd
+
+        data = {}
+        for name in self.columns:
+            column = self.column(name)
+            if column.ndim > 1:
+                if run is None:
+                    raise ValueError(f"Column {name!r} holds {column.shape[1:]} values per row; pass run")
+                column = column[:, run]
+            data[name] = column
+        return pd.DataFrame(data, copy=False)
+
+    def __repr__(self):
+        return f"SimulationLog({self.columns}, rows={len(self)})"
@@ -0,0 +1,121 @@
+"""Compact runtime state materialized from the State definitions and type mappings.
+
+Each state definition gets a RecordLayout, built once, that creates its
+records: plain dicts holding every variable of the definition, in order,
+at its default value. Since records are plain dicts, reading and writing a
+variable by the spec's name, state["Dummy"]["Total Length"], as the
+mechanisms do, is a dict lookup. For an entity with many instances the
+state is instead a NumPy structured array with one field per variable.
+Variables whose mapped Python type has a fixed width (int, float, bool)
+get native dtypes; any other type is an object field. Rows are read and
+written by the same names and whole columns, table["Total Length"], serve
+vectorized mechanisms.
+
+Variable metadata in the spec fills in what the type alone does not: an
+Entity Type variable with {"entity": name} is linked to that entity's
+record or table, and a variable with {"columns": [...]} starts as an instance of
+its mapped type built with those columns, e.g. the SimulationLog of
+"Simulation Log".
+"""
+import numpy as np
+
+FIXED_WIDTH_DTYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+# Entries the executor binds into the top-level state besides its variables
+RUNTIME_FIELDS = ("Metrics", "Stateful Metrics")
+
+
+def spec_python_types(math_spec_json, mapping):
+    """Map each spec type name to the Python type it is implemented as"""
+    return {spec_type["name"]: mapping[spec_type["type"]] for spec_type in math_spec_json["Types"]}
+
+
+def default_value(python_type, metadata=None):
+    metadata = metadata or {}
+    if "columns" in metadata:
+        return python_type(metadata["columns"])
+    if python_type is object:
+        return None
+    try:
+        return python_type()
+    except TypeError:
+        # Entity references and types that need arguments are set by the caller
+        return None
+
+
+class RecordLayout:
+    """The variables of one State definition, resolved once; calling it creates a record"""
+
+    __slots__ = ("name", "variables")
+
+    def __init__(self, state, python_types, extra=()):
+        self.name = state["name"]
+        # Variable name -> (Python type, spec metadata)
+        self.variables = {
+            variable["name"]: (python_types[variable["type"]], variable.get("metadata", {}))
+            for variable in state["variables"]
+        }
+        self.variables.update({name: (object, {}) for name in extra})
+
+    def __call__(self, values=None):
+        record = {
+            name: default_value(python_type, metadata) for name, (python_type, metadata) in self.variables.items()
+        }
+        if values:
+            unknown = values.keys() - record.keys()
+            if unknown:
+                raise KeyError(f"{self.name!r} has no variables {sorted(unknown)}")
+            record.update(values)
+        return record
+
+    def __repr__(self):
+        return f"RecordLayout({self.name!r}, {list(self.variables)})"
+
+
+def state_dtype(state, python_types):
+    """Structured dtype with a field per variable of a State definition"""
+    return np.dtype([
+        (variable["name"], FIXED_WIDTH_DTYPES.get(python_types[variable["type"]], object))
+        for variable in state["variables"]
+    ])
+
+
+def entity_table(state, python_types, n):
+    """Structured array of n instances of a State definition, at default values"""
+    table = np.zeros(n, dtype=state_dtype(state, python_types))
+    for variable in state["variables"]:
+        python_type = python_types[variable["type"]]
+        if python_type not in FIXED_WIDTH_DTYPES:
+            # Fill one by one so mutable defaults are not shared between instances
+            column = table[variable["name"]]
+            for i in range(n):
+                column[i] = default_value(python_type, variable.get("metadata"))
+    return table
+
+
+def materialize_state(math_spec_json, mapping, counts=None, top_level="Global"):
+    """Compact state of every entity, keyed by entity name.
+
+    Entities listed in counts become entity_table arrays of that many
+    instances; the others become a single record. The top_level entity's
+    record, the state wirings run on, also has the RUNTIME_FIELDS keys.
+    Entity-typed variables whose metadata names an entity are linked to
+    it; any others are left for the caller to link.
+    """
+    python_types = spec_python_types(math_spec_json, mapping)
+    states = {state["name"]: state for state in math_spec_json["State"]}
+    counts = counts or {}
+    materialized = {}
+    for entity in math_spec_json["Entities"]:
+        state = states[entity["state"]]
+        if entity["name"] in counts:
+            materialized[entity["name"]] = entity_table(state, python_types, counts[entity["name"]])
+        else:
+            extra = RUNTIME_FIELDS if entity["name"] == top_level else ()
+            materialized[entity["name"]] = RecordLayout(state, python_types, extra)()
+    for entity in math_spec_json["Entities"]:
+        for variable in states[entity["state"]]["variables"]:
+            linked = variable.get("metadata", {}).get("entity")
+            if linked is not None and entity["name"] not in counts:
+                materialized[entity["name"]][variable["name"]] = materialized[linked]
+    return materialized
@@ -1,7 +1,9 @@
+from .simulation_log import SimulationLog
+
 mapping = {
     "DummyABCDEFType": str,
     "DummyIntegerType": int,
     "DummyDecimalType": float,
     "EntityType": object,
-    "SimulationLogType": list,
+    "SimulationLogType": SimulationLog,
 }
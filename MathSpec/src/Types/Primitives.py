@@ -6,7 +6,7 @@ EntityType = {
 SimulationLogType = {
     "name": "Simulation Log Type",
     "type": "SimulationLogType",
-    "notes": "Will be a list of entries expanding over time",
+    "notes": "A columnar log with one row per logged step, optionally decimated, bounded to the last N steps or spilled to disk",
 }
 
 primitive_types = [EntityType, SimulationLogType]
@@ -0,0 +1,118 @@
+"""Tests for batched execution across runs: python -m pytest MathSpec"""
+import random
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from src import math_spec_json
+from src.Implementations.Python.batch import (
+    PER_RUN, BatchWiringCompiler, batch_params, batch_state, parameter_grid, scalar_fallback
+)
+from src.Implementations.Python.executor import WiringCompiler, bind_metrics
+from src.TypeMappings.simulation_log import SimulationLog
+
+LOG_COLUMNS = ["Time", "Word", "Length (Multiplied)"]
+PARAMS = {"DUMMY D Probability": 0.3, "DUMMY Length Multiplier": 2}
+OPTIONS = {"DUMMY Length-1 DEF Control Action": "DUMMY Length-1 DEF D Probability Option"}
+WORDS = ["A", "DE", "FFA", "BCAB", "", "EED"]
+
+
+def initial_state():
+    return {"Dummy": {"Words": "", "Total Length": 0}, "Time": 0, "Simulation Log": SimulationLog(LOG_COLUMNS)}
+
+
+def letter_count_spec():
+    """The spec plus a deterministic wiring that starts from a given word"""
+    spec = deepcopy(math_spec_json)
+    spec["Wiring"].append({
+        "name": "Letter Count Wiring",
+        "components": ["DUMMY Letter Count Policy", "DUMMY State Update Mechanisms",
+                       "DUMMY Log Simulation Data Mechanism"],
+        "description": "", "constraints": [], "type": "Stack",
+    })
+    return spec
+
+
+def run_rows(log, run, n):
+    """Rows logged for one run: a row of run values per step when vectorized, a row per run in turn otherwise"""
+    columns = [log[name] for name in LOG_COLUMNS]
+    if columns[0].ndim > 1:
+        return [tuple(column[:, run]) for column in columns]
+    return [tuple(column[run::n]) for column in columns]
+
+
+@pytest.mark.parametrize("vectorized", [None, {}], ids=["vectorized", "scalar_fallback"])
+def test_batched_runs_equal_scalar_runs(vectorized):
+    n = len(WORDS)
+    spec = letter_count_spec()
+    compiler = BatchWiringCompiler(spec, n, vectorized=vectorized)
+    batched_plan = compiler.compile("Letter Count Wiring")
+    scalar_plan = WiringCompiler(spec).compile("Letter Count Wiring")
+    batched = compiler.bind_metrics(batch_state(initial_state(), n))
+    params = batch_params(PARAMS, {"DUMMY Length Multiplier": np.arange(1, n + 1)})
+    runs = [bind_metrics(initial_state()) for _ in range(n)]
+    run_params = [dict(PARAMS, **{"DUMMY Length Multiplier": i + 1}) for i in range(n)]
+
+    for step in range(4):
+        words = np.array(np.roll(WORDS, step), dtype=object)
+        batched_plan(batched, params, [{"string": words}])
+        for i, run in enumerate(runs):
+            scalar_plan(run, run_params[i], [{"string": words[i]}])
+
+    nominal_length = batched["Stateful Metrics"]["DUMMY Nominal Length Stateful Metric"](batched, params)
+    for i, run in enumerate(runs):
+        assert batched["Dummy"]["Words"][i] == run["Dummy"]["Words"]
+        assert batched["Dummy"]["Total Length"][i] == run["Dummy"]["Total Length"]
+        assert batched["Time"][i] == run["Time"]
+        assert nominal_length[i] == run["Stateful Metrics"]["DUMMY Nominal Length Stateful Metric"](run, run_params[i])
+        rows = list(run["Simulation Log"])
+        expected = [tuple(row[name] for row in rows) for name in LOG_COLUMNS]
+        assert run_rows(batched["Simulation Log"], i, n) == expected
+
+
+def test_scalar_fallback_matches_scalar_runs_in_lockstep():
+    params, n = parameter_grid(PARAMS, {"DUMMY D Probability": [0.0, 0.5, 1.0], "DUMMY Length Multiplier": [1, 3]})
+    compiler = BatchWiringCompiler(math_spec_json, n, options=OPTIONS, vectorized={})
+    batched = compiler.bind_metrics(batch_state(initial_state(), n))
+    plan = compiler.compile("DUMMY Control Wiring")
+    scalar_plan = WiringCompiler(math_spec_json, options=OPTIONS).compile("DUMMY Control Wiring")
+    runs = [bind_metrics(initial_state()) for _ in range(n)]
+    run_params = [{name: params[name][i].item() for name in PARAMS} for i in range(n)]
+
+    # The fallback draws for each run in turn, as scalar runs stepped together do
+    random.seed(1)
+    for _ in range(10):
+        plan(batched, params)
+    random.seed(1)
+    for _ in range(10):
+        for run, run_param in zip(runs, run_params):
+            scalar_plan(run, run_param)
+
+    assert list(batched["Dummy"]["Words"]) == [run["Dummy"]["Words"] for run in runs]
+    assert list(batched["Dummy"]["Total Length"]) == [run["Dummy"]["Total Length"] for run in runs]
+    # D probability 0 never draws D and 1 always does
+    assert "D" not in batched["Dummy"]["Words"][0] and set(batched["Dummy"]["Words"][-1]) == {"D"}
+
+
+def test_only_entries_marked_per_run_are_sliced():
+    n = 3
+    seen = []
+
+    def block(state, params, spaces):
+        seen.append((state["Lookup"], params["Weights"], params["Offset"], spaces[0]["x"], spaces[0]["shared"]))
+        state["Counter"] += params["Offset"]
+
+    state = batch_state({"Counter": 0}, n)
+    # Arrays with one item per run that are not marked per run are shared by all runs
+    state["Lookup"] = np.arange(n)
+    params = batch_params({"Weights": np.ones(n)}, {"Offset": np.arange(n) + 1})
+    assert state[PER_RUN] == {("Counter",)} and params[PER_RUN] == {("Offset",)}
+
+    scalar_fallback(block, n)(state, params, [{"x": np.arange(n) * 10, "shared": 7}])
+    for i, (lookup, weights, offset, x, shared) in enumerate(seen):
+        np.testing.assert_array_equal(lookup, np.arange(n))
+        np.testing.assert_array_equal(weights, np.ones(n))
+        assert (offset, x, shared) == (i + 1, 10 * i, 7)
+    np.testing.assert_array_equal(state["Counter"], [1, 2, 3])
+    np.testing.assert_array_equal(state["Lookup"], np.arange(n))
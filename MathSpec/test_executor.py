@@ -0,0 +1,150 @@
+"""Tests for the compiled wiring executor: python -m pytest MathSpec"""
+import random
+
+import pytest
+
+from src import math_spec_json
+from src.Implementations.Python import implementation
+from src.Implementations.Python.ControlActions.Dummy import v2_dummy_control
+from src.Implementations.Python.executor import WiringCompiler, bind_metrics, compile_wirings
+from src.Implementations.Python.Mechanisms.Dummy import (
+    dummy_increment_time_mechanism, dummy_log_simulation_data_mechanism, dummy_update_dummy_entity_mechanism
+)
+from src.Implementations.Python.Policies.Dummy import dummy_letter_count_policy
+from src.TypeMappings.simulation_log import SimulationLog
+
+LOG_COLUMNS = ["Time", "Word", "Length (Multiplied)"]
+PARAMS = {"DUMMY D Probability": 0.3, "DUMMY Length Multiplier": 2}
+OPTIONS = {"DUMMY Length-1 DEF Control Action": "DUMMY Length-1 DEF D Probability Option"}
+
+
+def dummy_state():
+    state = {"Dummy": {"Words": "", "Total Length": 0}, "Time": 0, "Simulation Log": SimulationLog(LOG_COLUMNS)}
+    return bind_metrics(state)
+
+
+def test_plan_matches_hand_written_call_sequence():
+    plan = compile_wirings(math_spec_json, options=OPTIONS)["DUMMY Control Wiring"]
+    compiled, by_hand = dummy_state(), dummy_state()
+
+    random.seed(0)
+    for _ in range(20):
+        plan(compiled, PARAMS)
+    random.seed(0)
+    for _ in range(20):
+        spaces = v2_dummy_control(by_hand, PARAMS, [])
+        spaces = dummy_letter_count_policy(by_hand, PARAMS, spaces)
+        dummy_update_dummy_entity_mechanism(by_hand, PARAMS, spaces[0:1])
+        dummy_increment_time_mechanism(by_hand, PARAMS, spaces[1:1])
+        dummy_log_simulation_data_mechanism(by_hand, PARAMS, [])
+
+    assert compiled["Dummy"] == by_hand["Dummy"]
+    assert compiled["Time"] == by_hand["Time"] == 20
+    assert list(compiled["Simulation Log"]) == list(by_hand["Simulation Log"])
+
+
+def recorder(name, outputs):
+    """A block that records its call and returns outputs"""
+    def block(state, params, spaces):
+        state["calls"].append((name, list(spaces)))
+        return list(outputs)
+    return block
+
+
+def synthetic_spec(wirings, domains):
+    """A spec of mechanisms with the given domain sizes, wired by wirings"""
+    return {
+        "Mechanisms": [{"name": name, "domain": ["Space"] * size} for name, size in domains.items()],
+        "Wiring": wirings,
+    }
+
+
+def synthetic_implementation(blocks):
+    return {"mechanisms": blocks, "metrics": {}, "stateful_metrics": {}}
+
+
+def test_nested_stacks_and_parallels_are_flattened():
+    blocks = {
+        "A": recorder("A", ["a1", "a2", "a3", "a4"]),
+        "B": recorder("B", ["b"]),
+        "C": recorder("C", ["c1", "c2"]),
+        "D": recorder("D", []),
+        "E": recorder("E", ["e"]),
+        "F": recorder("F", ["f"]),
+    }
+    spec = synthetic_spec([
+        {"name": "Inner Parallel", "type": "Parallel", "components": ["B", "C"]},
+        {"name": "Outer Parallel", "type": "Parallel", "components": ["Inner Parallel", "D"]},
+        {"name": "Inner Stack", "type": "Stack", "components": ["E", "F"]},
+        {"name": "Top", "type": "Stack", "components": ["A", "Outer Parallel", "Inner Stack"]},
+    ], {"A": 0, "B": 1, "C": 2, "D": 1, "E": 3, "F": 1})
+    plan = WiringCompiler(spec, synthetic_implementation(blocks)).compile("Top")
+    # A, one Parallel group of B, C and D, then E and F inlined
+    assert len(plan.steps) == 4
+
+    compiled, by_hand = {"calls": []}, {"calls": []}
+    result = plan(compiled, {})
+    spaces = blocks["A"](by_hand, {}, [])
+    spaces = (blocks["B"](by_hand, {}, spaces[0:1]) + blocks["C"](by_hand, {}, spaces[1:3]) +
+              blocks["D"](by_hand, {}, spaces[3:4]))
+    spaces = blocks["E"](by_hand, {}, spaces)
+    spaces = blocks["F"](by_hand, {}, spaces)
+
+    assert compiled["calls"] == by_hand["calls"]
+    assert result == spaces == ["f"]
+
+
+@pytest.mark.parametrize("produced, skipped", [
+    (["x"], True),         # Fewer spaces than the optional block's domain
+    (["x", None], True),   # A None space
+    (["x", "y"], False),
+])
+def test_optional_component_is_skipped_without_its_spaces(produced, skipped):
+    blocks = {"A": recorder("A", produced), "X": recorder("X", ["from X"]), "Y": recorder("Y", [])}
+    spec = synthetic_spec([{"name": "Top", "type": "Stack", "components": ["A", "X", "Y"], "optional_indices": [1]}],
+                          {"A": 0, "X": 2, "Y": 1})
+    state = {"calls": []}
+    WiringCompiler(spec, synthetic_implementation(blocks)).compile("Top")(state, {})
+
+    called = [name for name, _ in state["calls"]]
+    assert called == (["A", "Y"] if skipped else ["A", "X", "Y"])
+    # A skipped component passes its input through unchanged
+    assert state["calls"][-1][1] == (produced if skipped else ["from X"])
+
+
+class CountingDict(dict):
+    lookups = 0
+
+    def __getitem__(self, key):
+        CountingDict.lookups += 1
+        return super().__getitem__(key)
+
+
+def test_bind_metrics_resolves_metrics_once():
+    def uses_metric(state, params, spaces):
+        state["total"] += state["Metrics"]["Double"](state, params, spaces)
+
+    metrics = CountingDict({"Double": lambda state, params, spaces: 2})
+    blocks = {"Uses Metric": uses_metric}
+    spec = synthetic_spec([{"name": "Top", "type": "Stack", "components": ["Uses Metric"]}], {"Uses Metric": 0})
+    custom = {"mechanisms": blocks, "metrics": metrics, "stateful_metrics": {}}
+    plan = WiringCompiler(spec, custom).compile("Top")
+    state = bind_metrics({"total": 0}, custom)
+
+    CountingDict.lookups = 0
+    for _ in range(10):
+        plan(state, {})
+    assert state["total"] == 20
+    # Steps read the bound copy, never the implementation's metrics
+    assert CountingDict.lookups == 0
+    assert type(state["Metrics"]) is dict and state["Metrics"] is not metrics
+
+
+def test_unknown_option_is_rejected_when_compiling():
+    with pytest.raises(ValueError, match="not an option"):
+        compile_wirings(math_spec_json, options={"DUMMY Length-1 DEF Control Action": "Missing Option"})
+
+
+def test_plans_are_compiled_once():
+    compiler = WiringCompiler(math_spec_json, implementation)
+    assert compiler.compile("DUMMY Control Wiring") is compiler.compile("DUMMY Control Wiring")
@@ -0,0 +1,104 @@
+"""Tests for the incremental report sync: python -m pytest MathSpec"""
+import filecmp
+import os
+from copy import deepcopy
+
+import pytest
+from math_spec_mapping import load_from_json, write_all_markdown_reports, write_parameter_table, write_spec_tree
+
+import report_sync
+from src import math_spec_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC_PAGES = {"Spec Tree.md", "Paramter Table.md"}
+
+
+@pytest.fixture
+def trees(monkeypatch, tmp_path):
+    """Markdown, Scaffold and sync state paths; the implementations load relative to MathSpec"""
+    monkeypatch.chdir(HERE)
+    return str(tmp_path / "Markdown"), str(tmp_path / "Scaffold"), str(tmp_path / "reports.json")
+
+
+def sync(spec, trees):
+    markdown_dir, scaffold_dir, state_path = trees
+    return report_sync.write_reports(load_from_json(deepcopy(spec)), spec, markdown_dir, scaffold_dir, state_path)
+
+
+def full_render(spec, path):
+    """The trees the library writers produce from scratch"""
+    ms = load_from_json(deepcopy(spec))
+    os.makedirs(path)
+    write_all_markdown_reports(ms, path, clear_folders=True)
+    write_spec_tree(ms, path=path, linking=True)
+    write_parameter_table(ms, path=path, linking=True)
+    return path
+
+
+def assert_same_pages(tree, reference, skip=()):
+    pages = report_sync._files(reference) - set(skip)
+    assert report_sync._files(tree) >= pages
+    assert [page for page in sorted(pages) if not filecmp.cmp(os.path.join(tree, page),
+                                                              os.path.join(reference, page), shallow=False)] == []
+
+
+def edit_description(spec):
+    spec["State"][1]["variables"][1]["description"] = "The clock time, in steps"
+
+
+def add_update(spec):
+    # A state and entity page now list the mechanism under Updated By
+    spec["Mechanisms"][1]["updates"].append(("DUMMY Entity", "Words", False))
+
+
+def rename_boundary_action(spec):
+    old, new = "DUMMY Length-1 ABC Boundary Action", "DUMMY Length-1 ABC Start Boundary Action"
+    spec["Boundary Actions"][0]["name"] = new
+    for wiring in spec["Wiring"]:
+        wiring["components"] = [new if component == old else component for component in wiring["components"]]
+
+
+def test_first_sync_matches_the_library_writers(trees, tmp_path):
+    markdown_dir, scaffold_dir, _ = trees
+    rendered = sync(math_spec_json, trees)
+    reference = full_render(math_spec_json, str(tmp_path / "reference"))
+
+    assert len(rendered) == len(report_sync.report_units(load_from_json(deepcopy(math_spec_json)), math_spec_json))
+    assert report_sync._files(markdown_dir) == report_sync._files(reference)
+    assert_same_pages(markdown_dir, reference)
+    assert report_sync._files(scaffold_dir) == report_sync._files(reference) - SPEC_PAGES
+    assert sync(math_spec_json, trees) == []
+
+
+@pytest.mark.parametrize("edit", [edit_description, add_update, rename_boundary_action])
+def test_edits_render_only_dependent_units_and_match_a_full_render(trees, tmp_path, edit):
+    markdown_dir, scaffold_dir, _ = trees
+    sync(math_spec_json, trees)
+    spec = deepcopy(math_spec_json)
+    edit(spec)
+
+    rendered = sync(spec, trees)
+    reference = full_render(spec, str(tmp_path / "reference"))
+    units = report_sync.report_units(load_from_json(deepcopy(spec)), spec)
+
+    assert 0 < len(rendered) < len(units)
+    assert report_sync._files(markdown_dir) == report_sync._files(reference)
+    assert_same_pages(markdown_dir, reference)
+    # The Scaffold keeps pages of removed components
+    assert_same_pages(scaffold_dir, reference, skip=SPEC_PAGES)
+
+
+def test_unchanged_pages_are_not_rewritten(trees):
+    markdown_dir, _, _ = trees
+    sync(math_spec_json, trees)
+    pages = report_sync._files(markdown_dir)
+    for page in pages:
+        os.utime(os.path.join(markdown_dir, page), ns=(0, 0))
+
+    spec = deepcopy(math_spec_json)
+    edit_description(spec)
+    sync(spec, trees)
+    rewritten = sorted(page for page in pages if os.stat(os.path.join(markdown_dir, page)).st_mtime_ns != 0)
+    # The variable's page and the tables of its state and entity
+    assert rewritten == [os.path.join("Entities", "Global.md"), os.path.join("State Variables", "Global State-Time.md"),
+                         os.path.join("States", "Global State.md")]
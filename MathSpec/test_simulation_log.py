@@ -0,0 +1,95 @@
+"""Tests for the columnar simulation log: python -m pytest MathSpec"""
+import numpy as np
+import pytest
+
+from src.TypeMappings.simulation_log import SimulationLog
+
+COLUMNS = ["Time", "Word", "Length (Multiplied)"]
+
+
+def row(step):
+    return step, "A" * (step % 4), 2.0 * step
+
+
+def filled(steps, **kwargs):
+    log = SimulationLog(COLUMNS, **kwargs)
+    for step in range(steps):
+        log.append_row(*row(step))
+    return log
+
+
+def test_append_row_matches_dict_entries():
+    by_row, by_entry = filled(10, capacity=4), SimulationLog(COLUMNS, capacity=4)
+    for step in range(10):
+        by_entry.append(dict(zip(COLUMNS, row(step))))
+
+    assert len(by_row) == len(by_entry) == 10
+    assert list(by_row) == list(by_entry) == [dict(zip(COLUMNS, row(step))) for step in range(10)]
+    # The buffer grew past its capacity
+    assert by_row.capacity == 16
+    assert by_row["Word"].dtype == object
+
+
+def test_every_keeps_every_kth_step():
+    log = filled(10, every=3)
+    assert log.steps == 10
+    assert len(log) == 4
+    np.testing.assert_array_equal(log["Time"], [0, 3, 6, 9])
+
+
+def test_window_keeps_the_last_rows_in_order():
+    log = filled(11, window=4)
+    assert len(log) == 4 and log.total == 11
+    np.testing.assert_array_equal(log["Time"], [7, 8, 9, 10])
+    assert list(log)[-1] == dict(zip(COLUMNS, row(10)))
+    # Before the ring wraps the rows are kept as they are
+    np.testing.assert_array_equal(filled(3, window=4)["Time"], [0, 1, 2])
+
+
+def test_window_cannot_spill(tmp_path):
+    with pytest.raises(ValueError, match="cannot spill"):
+        SimulationLog(COLUMNS, window=4, spill_dir=tmp_path)
+
+
+def test_spill_writes_full_chunks_and_reads_them_back(tmp_path):
+    log = filled(10, capacity=4, spill_dir=tmp_path)
+    assert len(log.chunks) == 2 and log.size == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["log_00000.npz", "log_00001.npz"]
+    # The buffer is reused rather than grown
+    assert log.capacity == 4
+
+    assert len(log) == 10
+    assert list(log) == [dict(zip(COLUMNS, row(step))) for step in range(10)]
+    assert log["Word"].dtype == object
+
+
+def test_batched_rows_hold_one_value_per_run():
+    log = SimulationLog(["Time", "Length (Multiplied)"])
+    for step in range(3):
+        log.append_row(np.full(4, step), np.arange(4) * step)
+    assert log["Time"].shape == (3, 4)
+    np.testing.assert_array_equal(log["Length (Multiplied)"][:, 2], [0, 2, 4])
+
+
+def test_to_frame_shares_memory_with_the_buffer():
+    pd = pytest.importorskip("pandas")
+    log = filled(5)
+    frame = log.to_frame()
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == COLUMNS and len(frame) == 5
+    for name, array in zip(COLUMNS, log._arrays):
+        assert np.shares_memory(frame[name].to_numpy(), array)
+
+
+def test_to_frame_picks_one_run_of_a_batched_log():
+    pytest.importorskip("pandas")
+    log = SimulationLog(["Time", "Length (Multiplied)"])
+    for step in range(3):
+        log.append_row(np.full(4, step), np.arange(4) * step)
+
+    with pytest.raises(ValueError, match="pass run"):
+        log.to_frame()
+    frame = log.to_frame(run=2)
+    np.testing.assert_array_equal(frame["Length (Multiplied)"], [0, 2, 4])
+    for name, array in zip(log.columns, log._arrays):
+        assert np.shares_memory(frame[name].to_numpy(), array)
@@ -0,0 +1,75 @@
+"""Tests for the content-hashed spec cache: python -m pytest MathSpec"""
+import json
+import logging
+import os
+from copy import deepcopy
+
+import pytest
+
+import spec_cache
+from src import math_spec_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Count the calls to load_from_json; the implementations load relative to MathSpec"""
+    monkeypatch.chdir(HERE)
+    calls = []
+    load_from_json = spec_cache.load_from_json
+
+    def counting_load(spec):
+        calls.append(spec)
+        return load_from_json(spec)
+
+    monkeypatch.setattr(spec_cache, "load_from_json", counting_load)
+    return calls
+
+
+def edited_spec():
+    """The spec with one component, the DUMMY State, edited"""
+    spec = deepcopy(math_spec_json)
+    spec["State"][0]["variables"][0]["description"] = "All words that were created so far"
+    return spec
+
+
+def test_unchanged_spec_is_served_from_the_cache(builds, tmp_path):
+    first = spec_cache.load_spec(math_spec_json, tmp_path)
+    second = spec_cache.load_spec(deepcopy(math_spec_json), tmp_path)
+
+    assert len(builds) == 1
+    assert second is not first
+    assert set(second.mechanisms) == set(first.mechanisms)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+
+def test_one_component_edit_invalidates_the_cache(builds, tmp_path, caplog):
+    spec_cache.load_spec(math_spec_json, tmp_path)
+    old_key = json.loads((tmp_path / "manifest.json").read_text())["key"]
+
+    with caplog.at_level(logging.INFO, logger=spec_cache.__name__):
+        ms = spec_cache.load_spec(edited_spec(), tmp_path)
+
+    assert len(builds) == 2
+    assert ms.state["DUMMY State"].variable_map["Words"].description == "All words that were created so far"
+    assert "Spec changed in 1 components: State/DUMMY State" in caplog.text
+    # The cache now holds only the edited spec
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["key"] != old_key
+    assert [path.stem for path in tmp_path.glob("*.pkl")] == [manifest["key"]]
+
+    spec_cache.load_spec(edited_spec(), tmp_path)
+    assert len(builds) == 2
+
+
+def test_changed_components_lists_added_removed_and_edited():
+    old = spec_cache.component_hashes(math_spec_json)
+    spec = edited_spec()
+    spec["Metrics"] = []
+    new = spec_cache.component_hashes(spec)
+
+    removed = [name for name in old if name.startswith("Metrics/")]
+    assert removed
+    assert spec_cache.changed_components(old, new) == sorted(removed + ["State/DUMMY State"])
+    assert spec_cache.changed_components(old, old) == []
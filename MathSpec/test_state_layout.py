@@ -0,0 +1,100 @@
+"""Tests for the state materialized from the State definitions: python -m pytest MathSpec"""
+import random
+import timeit
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src import math_spec_json
+from src.Implementations.Python.executor import bind_metrics, compile_wirings, initial_state
+from src.TypeMappings.simulation_log import SimulationLog
+from src.TypeMappings.state_layout import RecordLayout, entity_table, materialize_state, spec_python_types
+from src.TypeMappings.types import mapping
+
+LOG_COLUMNS = ["Time", "Word", "Length (Multiplied)"]
+PARAMS = {"DUMMY D Probability": 0.3, "DUMMY Length Multiplier": 2}
+STATES = {state["name"]: state for state in math_spec_json["State"]}
+
+
+def dict_state():
+    state = {"Dummy": {"Words": "", "Total Length": 0}, "Time": 0, "Simulation Log": SimulationLog(LOG_COLUMNS)}
+    return bind_metrics(state)
+
+
+def run(state, steps=20):
+    plan = compile_wirings(math_spec_json)["DUMMY Control Wiring"]
+    random.seed(0)
+    for _ in range(steps):
+        plan(state, PARAMS)
+    return state
+
+
+def test_materialized_state_follows_the_spec():
+    materialized = materialize_state(math_spec_json, mapping)
+    state = materialized["Global"]
+    assert list(state) == ["Dummy", "Time", "Simulation Log", "Metrics", "Stateful Metrics"]
+    assert state["Dummy"] is materialized["DUMMY Entity"]
+    assert state["Dummy"] == {"Words": "", "Total Length": 0} and state["Time"] == 0
+    # The log's columns come from the variable's metadata
+    assert isinstance(state["Simulation Log"], SimulationLog)
+    assert state["Simulation Log"].columns == LOG_COLUMNS
+
+
+def test_round_trip_with_the_dict_state():
+    materialized, by_dict = run(initial_state(math_spec_json)), run(dict_state())
+
+    assert materialized["Dummy"] == by_dict["Dummy"]
+    assert materialized["Time"] == by_dict["Time"] == 20
+    assert list(materialized["Simulation Log"]) == list(by_dict["Simulation Log"])
+    # Records are the dict state, so a dict state loads back unchanged
+    layout = RecordLayout(STATES["DUMMY State"], spec_python_types(math_spec_json, mapping))
+    assert layout(by_dict["Dummy"]) == by_dict["Dummy"]
+
+
+def test_unknown_variables_are_rejected():
+    layout = RecordLayout(STATES["DUMMY State"], spec_python_types(math_spec_json, mapping))
+    with pytest.raises(KeyError, match="Total Words"):
+        layout({"Total Words": 1})
+
+
+def test_wirings_run_on_a_table_row():
+    state = initial_state(math_spec_json, counts={"DUMMY Entity": 1000})
+    # The linked variable holds the whole table; each step runs on one row of it
+    table = state["Dummy"]
+    assert table.shape == (1000,)
+    state["Dummy"] = table[10]
+    by_dict = run(dict_state())
+    run(state)
+
+    assert table["Words"][10] == by_dict["Dummy"]["Words"]
+    assert table["Total Length"][10] == by_dict["Dummy"]["Total Length"]
+    assert table["Total Length"].sum() == by_dict["Dummy"]["Total Length"]
+
+
+def test_name_access_costs_a_dict_lookup():
+    record = materialize_state(math_spec_json, mapping)["DUMMY Entity"]
+    plain = {"Words": "", "Total Length": 0}
+    assert type(record) is dict
+
+    def best(stmt, state):
+        return min(timeit.repeat(stmt, globals={"state": state}, number=100000, repeat=5))
+
+    assert best('state["Total Length"]', record) < 1.5 * best('state["Total Length"]', plain)
+
+
+def test_tables_take_less_memory_per_entity_than_records():
+    python_types = spec_python_types(math_spec_json, mapping)
+    layout = RecordLayout(STATES["DUMMY State"], python_types)
+    n = 10000
+
+    tracemalloc.start()
+    records = [layout() for _ in range(n)]
+    record_bytes = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    table = entity_table(STATES["DUMMY State"], python_types, n)
+
+    # An int64 field and an object pointer per row
+    assert table.nbytes / n == 16
+    assert table.nbytes / n < record_bytes
+    assert len(records) == n and np.all(table["Total Length"] == 0)
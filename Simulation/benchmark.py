@@ -0,0 +1,203 @@
+"""Benchmarks for the simulation hot paths.
+
+Times the per-epoch kernels and a short run_simulation across network
+sizes, records peak traced memory, and writes machine-readable JSON so
+runs at different commits can be compared:
+
+    python Simulation/benchmark.py --output bench.json
+    python Simulation/benchmark.py --output new.json --compare bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from simulation import (
+    EconomicParameters, LongTermSimulation, NetworkGrowthParameters, NodeType,
+    RandomEngine, StorachaSystem, logger
+)
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 200_000)
+
+# Share of the network per node type
+NETWORK_MIX = {
+    NodeType.OSN: 0.5,
+    NodeType.RAN: 0.4,
+    NodeType.IN: 0.08,
+    NodeType.FN: 0.02
+}
+
+def build_system(total_nodes: int, seed: int = 0) -> StorachaSystem:
+    """Network of total_nodes nodes in NETWORK_MIX proportions at 1.5x minimum stake"""
+    system = StorachaSystem(rng=RandomEngine(seed))
+    for node_type, share in NETWORK_MIX.items():
+        count = max(1, int(total_nodes * share))
+        system.add_nodes(node_type, count, system.get_min_stake(node_type) * 1.5)
+    # Warm up so reputations, rewards and slashes are in a steady state
+    system.simulate_epoch()
+    return system
+
+def _with_work(total_nodes: int) -> StorachaSystem:
+    """build_system with storage work on every OSN so KPI rewards are paid"""
+    system = build_system(total_nodes)
+    system.nodes[NodeType.OSN.name].storage_used = 1e9
+    system.simulate_epoch()
+    return system
+
+def _next_epoch(system: StorachaSystem) -> StorachaSystem:
+    # Utilization is cached per epoch; advance it so every call does the work
+    system.current_epoch += 1
+    return system
+
+def _long_term(total_nodes: int, days: int) -> LongTermSimulation:
+    """LongTermSimulation over a prebuilt network that runs only its last days days"""
+    sim = LongTermSimulation(NetworkGrowthParameters(years=1), EconomicParameters(), seed=0)
+    sim.system = build_system(total_nodes)
+    sim.completed_days = 365 - days
+    return sim
+
+# name -> (setup(total_nodes), operation(state), largest size to run or None)
+BENCHMARKS: Dict[str, tuple] = {
+    'simulate_epoch': (build_system, lambda system: system.simulate_epoch(), None),
+    'distribute_rewards': (build_system, lambda system: system.distribute_rewards(), None),
+    'verify_nodes': (build_system, lambda system: system.verify_nodes(), None),
+    'calculate_network_utilization': (
+        build_system, lambda system: _next_epoch(system).calculate_network_utilization(), None),
+    '_update_metrics_batch': (
+        lambda n: _long_term(n, 1), lambda sim: sim._update_metrics_batch(0, 0.0, 1.0), None),
+    # Per-node KPI rewards re-sum the type's work on every call, an O(n^2) loop overall;
+    # the scaling exponent shows when that term overtakes the per-node overhead
+    'calculate_kpi_rewards_per_node': (
+        _with_work,
+        lambda system: [system.calculate_kpi_rewards(NodeType.OSN, node)
+                        for node in system.nodes[NodeType.OSN.name]],
+        20_000),
+    'run_simulation_7_days': (lambda n: _long_term(n, 7), lambda sim: sim.run_simulation(), 10_000)
+}
+
+def time_operation(setup: Callable, operation: Callable, total_nodes: int,
+                   repeats: int, min_seconds: float) -> Dict[str, float]:
+    """Median and best wall time per call, and peak traced memory of one call"""
+    state = setup(total_nodes)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeats or time.perf_counter() - started < min_seconds:
+        # run_simulation consumes its days, so stateful benchmarks get a fresh setup
+        if isinstance(state, LongTermSimulation) and state.completed_days >= 365:
+            state = setup(total_nodes)
+        begin = time.perf_counter()
+        operation(state)
+        timings.append(time.perf_counter() - begin)
+        if len(timings) >= 1000:
+            break
+
+    state = setup(total_nodes)
+    tracemalloc.start()
+    operation(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': float(np.median(timings)),
+        'best_seconds': float(np.min(timings)),
+        'calls': len(timings),
+        'peak_memory_bytes': int(peak)
+    }
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """Slope of log(time) against log(nodes); ~1 is linear, ~2 quadratic"""
+    # Small networks are dominated by fixed overhead
+    points = [(n, t) for n, t in zip(sizes, seconds) if n >= 1_000 and t > 0]
+    if len(points) < 2:
+        return None
+    n, t = np.log(np.array(points)).T
+    return float(np.polyfit(n, t, 1)[0])
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names: Optional[List[str]] = None,
+                   repeats: int = 5, min_seconds: float = 0.2) -> dict:
+    names = names or list(BENCHMARKS)
+    results = []
+    scaling = {}
+    for name in names:
+        setup, operation, max_nodes = BENCHMARKS[name]
+        measured = []
+        for total_nodes in sizes:
+            if max_nodes is not None and total_nodes > max_nodes:
+                continue
+            timing = time_operation(setup, operation, total_nodes, repeats, min_seconds)
+            results.append({'benchmark': name, 'nodes': total_nodes, **timing})
+            measured.append((total_nodes, timing['seconds']))
+            print(f"{name:32s} {total_nodes:>8d} nodes  {timing['seconds'] * 1e3:10.3f} ms  "
+                  f"{timing['peak_memory_bytes'] / 2**20:8.2f} MiB")
+        scaling[name] = scaling_exponent(*zip(*measured)) if measured else None
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'results': results,
+        'scaling_exponents': scaling
+    }
+
+def compare(baseline: dict, current: dict, tolerance: float = 1.25) -> List[dict]:
+    """Benchmarks whose median time grew by more than tolerance times the baseline"""
+    previous = {(r['benchmark'], r['nodes']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get((result['benchmark'], result['nodes']))
+        if before and result['seconds'] > before * tolerance:
+            regressions.append({'benchmark': result['benchmark'], 'nodes': result['nodes'],
+                                'baseline_seconds': before, 'seconds': result['seconds'],
+                                'ratio': result['seconds'] / before})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulation hot paths")
+    parser.add_argument('--output', default='Simulation/results/benchmark.json')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--compare', help="baseline JSON to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    args = parser.parse_args()
+
+    # Per-epoch INFO logging would dominate the timings of the small kernels
+    logger.setLevel(logging.WARNING)
+    report = run_benchmarks(args.sizes, args.benchmarks, args.repeats)
+
+    print("\nScaling exponents (time ~ nodes^k):")
+    for name, exponent in report['scaling_exponents'].items():
+        print(f"  {name:32s} {'n/a' if exponent is None else f'{exponent:.2f}'}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['regressions'] = compare(json.load(f), report, args.tolerance)
+        for regression in report['regressions']:
+            print(f"REGRESSION {regression['benchmark']} at {regression['nodes']} nodes: "
+                  f"{regression['ratio']:.2f}x slower")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+    if args.compare and report['regressions']:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()